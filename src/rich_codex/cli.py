@@ -211,6 +211,13 @@ log = logging.getLogger()
     show_envvar=True,
     help="Use a pseudo-terminal for commands (may capture coloured output)",
 )
+@click.option(
+    "--png-width",
+    type=int,
+    envvar="PNG_WIDTH",
+    show_envvar=True,
+    help="Width of PNG images in pixels (default: scaled to terminal width)",
+)
 @click.option(
     "-v",
     "--verbose",
@@ -265,6 +272,7 @@ def main(
     terminal_theme,
     snippet_theme,
     use_pty,
+    png_width,
     verbose,
     save_log,
     log_file,
@@ -372,6 +380,7 @@ def main(
             terminal_theme=terminal_theme,
             snippet_theme=snippet_theme,
             use_pty=use_pty,
+            png_width=png_width,
             console=console,
         )
         img_obj.no_confirm = no_confirm
@@ -415,6 +424,7 @@ def main(
         terminal_theme=terminal_theme,
         snippet_theme=snippet_theme,
         use_pty=use_pty,
+        png_width=png_width,
         console=console,
     )
     try:
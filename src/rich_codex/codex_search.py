@@ -46,6 +46,7 @@ class CodexSearch:
         terminal_theme,
         snippet_theme,
         use_pty,
+        png_width,
         console,
     ):
         """Initialize the search object."""
@@ -75,6 +76,7 @@ class CodexSearch:
         self.terminal_theme = terminal_theme
         self.snippet_theme = snippet_theme
         self.use_pty = use_pty
+        self.png_width = png_width
         self.console = Console() if console is None else console
         self.rich_imgs = []
         self.num_img_saved = 0
@@ -98,6 +100,7 @@ class CodexSearch:
             "terminal_theme",
             "snippet_theme",
             "use_pty",
+            "png_width",
         ]
 
         # Look in .gitignore to add to search_exclude
@@ -316,7 +319,7 @@ class CodexSearch:
         # Overwrite class-level configs
         for cls in self.class_config_attrs:
             if cls in config:
-                setattr(self, cls, config["cls"])
+                setattr(self, cls, config[cls])
 
         for output in config["outputs"]:
             log.debug(f"Found valid output in '{config_fn}': {output}")
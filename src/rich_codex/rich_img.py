@@ -1,13 +1,18 @@
+import codecs
 import difflib
+import hashlib
 import json
 import logging
+import operator
 import os
 import re
 import signal
 import subprocess
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from shutil import copyfile
-from tempfile import gettempdir, mkstemp
 
 import rich.terminal_theme
 import yaml
@@ -16,6 +21,7 @@ from rich.ansi import AnsiDecoder
 from rich.console import Console
 from rich.prompt import Confirm
 from rich.syntax import Syntax
+from rich.text import Text
 
 log = logging.getLogger("rich-codex")
 
@@ -24,13 +30,55 @@ config_schema_fn = Path(__file__).parent / "config-schema.yml"
 with config_schema_fn.open() as fh:
     config_schema = yaml.safe_load(fh)
 RICH_IMG_ATTRS = config_schema["properties"]["outputs"]["items"]["properties"].keys()
+# Fetch all of the above from a RichImg object in one call, for comparison / hashing
+_get_rich_img_attrs = operator.attrgetter(*RICH_IMG_ATTRS)
+_get_rich_img_attrs_no_fn = operator.attrgetter(*[attr for attr in RICH_IMG_ATTRS if attr != "img_paths"])
 
 # Base list of commands to ignore
 IGNORE_COMMANDS = ["rm", "cp", "mv", "sudo"]
+# Matches any of the above at the start of the command or after a shell separator / subshell
+IGNORE_COMMANDS_RE = re.compile(r"(?:^|[|;&(`\n])\s*(?P<cmd>{})\b".format("|".join(map(re.escape, IGNORE_COMMANDS))))
 
 # Base list of diff regexes to ignore, split up by filetype suffix
 IGNORE_REGEXES = {".pdf": [r"/CreationDate"]}
 
+# Rendered SVGs from this run, keyed by a digest of the recorded console output
+# Lets identical terminal output skip the (slow, pure-python) SVG export
+# Bounded by total size as well as count, as SVGs of long outputs run to megabytes
+SVG_CACHE_SIZE = 64
+SVG_CACHE_MAX_CHARS = 32 * 1024 * 1024
+_SVG_CACHE = OrderedDict()
+
+# Decoded lines of command output, keyed by the ANSI decoder style and the raw line
+# Repeated lines (eg. log output) skip the ANSI escape code parser
+ANSI_LINE_CACHE_SIZE = 4096
+_ANSI_LINE_CACHE = OrderedDict()
+
+# Recording consoles are only ever exported, so share one output sink
+# Released consoles are kept for reuse, keyed by width
+_DEVNULL = open(os.devnull, "w")
+_CONSOLE_POOL = {}
+
+# Worker processes for converting to PNG and PDF side by side, started on first use and shared by all images
+# Set to False if worker processes can't be started here, to convert in-process from then on
+_CONVERT_EXECUTOR = None
+
+
+def _get_convert_executor():
+    """Get the shared process pool for SVG conversion, starting it if needed."""
+    global _CONVERT_EXECUTOR
+    if _CONVERT_EXECUTOR is None:
+        _CONVERT_EXECUTOR = ProcessPoolExecutor(max_workers=2)
+    return _CONVERT_EXECUTOR
+
+
+def _disable_convert_executor():
+    """Stop using worker processes for SVG conversion."""
+    global _CONVERT_EXECUTOR
+    if _CONVERT_EXECUTOR:
+        _CONVERT_EXECUTOR.shutdown(wait=False)
+    _CONVERT_EXECUTOR = False
+
 
 class RichImg:
     """Image generation for rich-codex.
@@ -65,6 +113,7 @@ class RichImg:
         terminal_theme=None,
         snippet_theme=None,
         use_pty=False,
+        png_width=None,
         console=None,
         source_type=None,
         source=None,
@@ -97,8 +146,10 @@ class RichImg:
         self.terminal_theme = terminal_theme
         self.snippet_theme = snippet_theme
         self.use_pty = use_pty
+        self.png_width = None if png_width is None else int(png_width)
         self.console = Console() if console is None else console
         self.capture_console = None
+        self._capture_console_width = None
         self.num_img_saved = 0
         self.num_img_skipped = 0
         self.no_confirm = False
@@ -111,17 +162,28 @@ class RichImg:
         if not isinstance(other, RichImg):
             # don't attempt to compare against unrelated types
             return NotImplemented
-        return all(getattr(self, attr) == getattr(other, attr) for attr in RICH_IMG_ATTRS)
+        if other is self:
+            return True
+        return _get_rich_img_attrs(self) == _get_rich_img_attrs(other)
 
     def __hash__(self):
         """Hash stable identifier of RichImg object based on important attributes."""
-        attrs = str([getattr(self, attr) for attr in RICH_IMG_ATTRS])
-        return hash(attrs)
+        return hash(self._key())
 
     def _hash_no_fn(self):
         """Hash stable identifier of RichImg object based without output filenames."""
-        attrs = str([getattr(self, attr) for attr in RICH_IMG_ATTRS if attr != "img_paths"])
-        return hash(attrs)
+        return hash(self._key(include_paths=False))
+
+    def _key(self, include_paths=True):
+        """Tuple of important attributes, with lists and dicts made hashable."""
+        key = []
+        for value in _get_rich_img_attrs(self) if include_paths else _get_rich_img_attrs_no_fn(self):
+            if isinstance(value, list):
+                value = tuple(value)
+            elif isinstance(value, dict):
+                value = tuple(sorted((str(k), str(v)) for k, v in value.items()))
+            key.append(value)
+        return tuple(key)
 
     def confirm_command(self):
         """Prompt user to confirm running command."""
@@ -137,11 +199,13 @@ class RichImg:
 
         self.command = self.command.strip()
 
-        for ignore in IGNORE_COMMANDS:
-            if any(cmd_part.strip().startswith(ignore) for cmd_part in self.command.split("&;")):
-                log.warning(f"Ignoring command because it contained '{ignore}': [white on black] {self.command} [/]")
-                self.aborted = True
-                return False
+        ignore_match = IGNORE_COMMANDS_RE.search(self.command)
+        if ignore_match:
+            log.warning(
+                f"Ignoring command because it contained '{ignore_match['cmd']}': [white on black] {self.command} [/]"
+            )
+            self.aborted = True
+            return False
 
         if self.title == "" and self.title_command:
             self.title = self.fake_command if self.fake_command else self.command
@@ -152,6 +216,7 @@ class RichImg:
             try:
                 import fcntl
                 import pty
+                import select
                 import struct
                 import termios
 
@@ -216,40 +281,58 @@ class RichImg:
             signal.signal(signal.SIGWINCH, lambda s, f: fcntl.ioctl(read_end, termios.TIOCSWINSZ, size))
 
             # Run subprocess in pty
-            try:
-                process = subprocess.Popen(
-                    self.command,
-                    cwd=self.working_dir,
-                    shell=True,
-                    env=command_env,
-                    close_fds=True,
-                    preexec_fn=os.setsid,
-                    stdin=write_end,
-                    stdout=write_end,
-                    stderr=write_end,
-                )
-                process.wait(timeout=float(self.timeout))
-            except subprocess.TimeoutExpired:
-                log.info(f"Command '{self.command}' timed out after {self.timeout} seconds")
-                os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+            process = subprocess.Popen(
+                self.command,
+                cwd=self.working_dir,
+                shell=True,
+                env=command_env,
+                close_fds=True,
+                preexec_fn=os.setsid,
+                stdin=write_end,
+                stdout=write_end,
+                stderr=write_end,
+            )
             os.close(write_end)
 
-            output_arr = []
-
+            # Read output whilst the command runs, so that it can't block on a full pty buffer
             # This loop will keep going until no more data is incoming (child process closed their pipe)
+            # Decode as we go, with an incremental decoder as characters can be split across reads
+            output_arr = []
+            utf8_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            deadline = time.monotonic() + float(self.timeout)
+            timed_out = False
             while True:
+                remaining = None if timed_out else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    log.info(f"Command '{self.command}' timed out after {self.timeout} seconds")
+                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+                    timed_out = True
+                    remaining = None
+                ready, _, _ = select.select([read_end], [], [], remaining)
+                if not ready:
+                    continue
                 try:
-                    data = os.read(read_end, 1024)
+                    data = os.read(read_end, 65536)
                 except OSError:
                     data = b""
 
                 if data:
-                    output_arr.append(data)
+                    output_arr.append(utf8_decoder.decode(data))
                 else:
                     break
 
+            # The command may have let go of the pty but still be running, so keep to the deadline
+            if not timed_out:
+                try:
+                    process.wait(timeout=max(0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    log.info(f"Command '{self.command}' timed out after {self.timeout} seconds")
+                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+            process.wait()
+
             os.close(read_end)
-            output = b"".join(output_arr).decode("utf-8")
+            output_arr.append(utf8_decoder.decode(b"", final=True))
+            output = "".join(output_arr)
 
         # Run the command without messing with ttys
         else:
@@ -269,7 +352,7 @@ class RichImg:
                 log.info(f"Command '{self.command}' timed out after {self.timeout} seconds")
                 os.killpg(os.getpgid(process.pid), signal.SIGKILL)
                 output, errs = process.communicate()
-            output = output.decode("utf-8")
+            output = output.decode("utf-8", errors="replace")
 
         # Run after_command if set
         if self.after_command:
@@ -290,14 +373,11 @@ class RichImg:
             #     )
             # )
 
-        decoder = AnsiDecoder()
+        output_lines = self._decode_output(output)
 
         # Count lines and find longest line
-        print_lines = []
-        max_line_length = 0
-        for line in decoder.decode(output):
-            print_lines.append(True)
-            max_line_length = max(len(line), max_line_length)
+        print_lines = [True] * len(output_lines)
+        max_line_length = max((len(line) for line in output_lines), default=0)
 
         # If terminal_min_width is set, find longest line
         t_width = int(self.terminal_width) if self.terminal_width else None
@@ -305,14 +385,7 @@ class RichImg:
             t_width = int(self.terminal_min_width)
             t_width = max(t_width, max_line_length)
             log.debug(f"Setting terminal width to {t_width}")
-        self.capture_console = Console(
-            file=open(os.devnull, "w"),
-            force_terminal=True,
-            color_system="truecolor",
-            highlight=False,
-            record=True,
-            width=t_width,
-        )
+        self.capture_console = self._get_capture_console(t_width)
 
         # Set head / tail print set
         if self.head and self.head >= len(print_lines):
@@ -334,17 +407,66 @@ class RichImg:
                 )
             )
 
-        # Decode and print the output (captured)
-        for idx, line in enumerate(decoder.decode(output)):
+        # Collect the decoded output lines to print
+        print_text = []
+        for idx, line in enumerate(output_lines):
             if print_lines[idx]:
-                self.capture_console.print(line)
+                print_text.append(line)
                 # Trim text after trim_after
                 if self.trim_after and self.trim_after in line:
                     break
             elif (self.head is not None or self.tail is not None) and self.truncated_text:
-                self.capture_console.print(self.truncated_text, style="italic dim")
+                print_text.append(self.capture_console.render_str(self.truncated_text, style="italic dim"))
                 self.truncated_text = None
 
+        # Print the output (captured) in one go, rather than line by line
+        if print_text:
+            self.capture_console.print(Text("\n").join(print_text))
+
+    def _get_capture_console(self, width):
+        """Get a recording console of the given width, reusing a released one if possible."""
+        self.release_console()
+        # Pool under the requested width, the console may resolve a width of None differently
+        self._capture_console_width = width
+        if _CONSOLE_POOL.get(width):
+            return _CONSOLE_POOL[width].pop()
+        return Console(
+            file=_DEVNULL,
+            force_terminal=True,
+            color_system="truecolor",
+            highlight=False,
+            record=True,
+            width=width,
+        )
+
+    def release_console(self):
+        """Clear the recording console and return it to the pool for reuse."""
+        if self.capture_console is None:
+            return
+        with self.capture_console._record_buffer_lock:
+            del self.capture_console._record_buffer[:]
+        _CONSOLE_POOL.setdefault(self._capture_console_width, []).append(self.capture_console)
+        self.capture_console = None
+        self._capture_console_width = None
+
+    def _decode_output(self, output):
+        """Decode ANSI codes in command output to a list of rich Text lines."""
+        decoder = AnsiDecoder()
+        output_lines = []
+        for line in output.splitlines():
+            # Decoder style carries over between lines, so is part of the key
+            cache_key = (decoder.style, line)
+            if cache_key in _ANSI_LINE_CACHE:
+                _ANSI_LINE_CACHE.move_to_end(cache_key)
+            else:
+                text = decoder.decode_line(line)
+                _ANSI_LINE_CACHE[cache_key] = (text, decoder.style)
+                if len(_ANSI_LINE_CACHE) > ANSI_LINE_CACHE_SIZE:
+                    _ANSI_LINE_CACHE.popitem(last=False)
+            text, decoder.style = _ANSI_LINE_CACHE[cache_key]
+            output_lines.append(text)
+        return output_lines
+
     def format_snippet(self):
         """Take a text snippet and format it using rich."""
         if self.snippet is None:
@@ -352,7 +474,8 @@ class RichImg:
             return
 
         # Reformat JSON with pretty printing, because we can
-        if self.snippet_syntax == "json" or self.snippet_syntax is None:
+        # Without a syntax, only try to parse snippets that look like a JSON object / array
+        if self.snippet_syntax == "json" or (self.snippet_syntax is None and self.snippet.lstrip()[:1] in ("{", "[")):
             try:
                 json_snippet = json.loads(self.snippet)
                 self.snippet = json.dumps(json_snippet, indent=4, sort_keys=True)
@@ -368,14 +491,7 @@ class RichImg:
                 t_width = max(len(line), t_width)
             log.debug(f"Setting terminal width to {t_width}")
 
-        self.capture_console = Console(
-            file=open(os.devnull, "w"),
-            force_terminal=True,
-            color_system="truecolor",
-            highlight=False,
-            record=True,
-            width=t_width,
-        )
+        self.capture_console = self._get_capture_console(t_width)
 
         # Print with rich Syntax highlighter
         log.debug(f"Formatting snippet as {self.snippet_syntax}")
@@ -392,8 +508,7 @@ class RichImg:
         else:
             log.warning("Tried to get output with no command or snippet")
 
-    def _enough_image_difference(self, new_fn, old_fn):
-        new_file = Path(new_fn)
+    def _enough_image_difference(self, new_data, old_fn):
         old_file = Path(old_fn)
         create_file = True
         log_msg = ""
@@ -405,7 +520,7 @@ class RichImg:
         else:
             # Percentage change in file
             # This method works even with entirely binary files, no decoding required
-            pct_change = (1 - ratio(new_file.read_bytes(), old_file.read_bytes())) * 100.0
+            pct_change = (1 - ratio(new_data, old_file.read_bytes())) * 100.0
             if pct_change <= float(self.min_pct_diff):
                 create_file = False
             log_msg = f"{pct_change:.2f}% change"
@@ -414,24 +529,19 @@ class RichImg:
             if pct_change > 0:
 
                 # Regex on file diff to skip
-                skip_regexes = list(r for r in IGNORE_REGEXES.get(new_file.suffix, []))  # deep copy
+                skip_regexes = list(r for r in IGNORE_REGEXES.get(old_file.suffix.lower(), []))  # deep copy
                 if self.skip_change_regex:
                     skip_regexes.extend(self.skip_change_regex.splitlines())
                 if len(skip_regexes) > 0:
-                    new_file_lines = new_file.read_text(errors="ignore").splitlines()
+                    new_file_lines = new_data.decode("utf-8", errors="ignore").splitlines()
                     old_file_lines = old_file.read_text(errors="ignore").splitlines()
-                    log.info("Checking diff")
 
                     # Only continue if we found something to diff with
                     if len(new_file_lines) > 0 or len(old_file_lines) > 0:
-                        log.info("starting..")
                         diffs = difflib.Differ().compare(new_file_lines, old_file_lines)
-                        log.info("generated diff ")
-                        log.info(f"len: {len(list(diffs))}")
                         lost_lines = [d for d in diffs if d.startswith("-")]
 
                         # Only continue if there was some diff
-                        log.info(f"Found {lost_lines} lines")
                         if len(lost_lines) > 0:
                             matched_lost_lines = []
                             for skip_regex in skip_regexes:
@@ -457,14 +567,45 @@ class RichImg:
 
         return create_file
 
+    def _get_svg(self, terminal_theme):
+        """Export the captured console as an SVG string, reusing identical earlier renders."""
+        recorded_text = self.capture_console.export_text(clear=False, styles=True)
+        cache_key = (
+            hashlib.sha1(recorded_text.encode("utf-8")).hexdigest(),
+            self.capture_console.width,
+            self.title,
+            self.terminal_theme if terminal_theme else None,
+        )
+        if cache_key in _SVG_CACHE:
+            log.debug("Using cached SVG render")
+            _SVG_CACHE.move_to_end(cache_key)
+            return _SVG_CACHE[cache_key]
+
+        svg_content = self.capture_console.export_svg(title=self.title, theme=terminal_theme)
+        if len(svg_content) > SVG_CACHE_MAX_CHARS:
+            return svg_content
+        _SVG_CACHE[cache_key] = svg_content
+        while len(_SVG_CACHE) > SVG_CACHE_SIZE or sum(map(len, _SVG_CACHE.values())) > SVG_CACHE_MAX_CHARS:
+            _SVG_CACHE.popitem(last=False)
+        return svg_content
+
     def save_images(self):
         """Save the images to the specified filenames."""
         if self.aborted:
+            self.release_console()
+            return
+        if self.capture_console is None:
+            log.warning("Tried to save images with no captured output")
             return
         if len(self.img_paths) == 0:
             log.warning("Tried to save images with no paths")
+            self.release_console()
             return
 
+        # Drop duplicate output paths, eg. the same image found in a config file and markdown
+        img_paths = list(dict.fromkeys(str(Path(fn).resolve()) for fn in self.img_paths))
+        img_suffixes = {Path(fn).suffix.lower() for fn in img_paths}
+
         # Set up theme
         terminal_theme = None
         if self.terminal_theme:
@@ -477,101 +618,64 @@ class RichImg:
                     )
                 )
 
-        # Save image as requested with $IMG_PATHS
-        svg_img = None
-        png_img = None
-        pdf_img = None
-        for filename in self.img_paths:
-
-            # Make directories if necessary
-            Path(filename).parent.mkdir(parents=True, exist_ok=True)
-
-            # If already made this image, copy it from the last destination
-            if filename.lower().endswith(".png") and png_img is not None:
-                log.debug(f"Using '{png_img}' for '{filename}'")
-                if self._enough_image_difference(png_img, filename):
-                    copyfile(png_img, filename)
-                continue
-            if filename.lower().endswith(".pdf") and pdf_img is not None:
-                log.debug(f"Using '{pdf_img}' for '{filename}'")
-                if self._enough_image_difference(pdf_img, filename):
-                    copyfile(pdf_img, filename)
-                continue
-            if filename.lower().endswith(".svg") and svg_img is not None:
-                log.debug(f"Using '{svg_img}' for '{filename}'")
-                if self._enough_image_difference(svg_img, filename):
-                    copyfile(svg_img, filename)
-                continue
-
-            # Set filenames
-            tmp_filename = mkstemp()[1]
-
-            # We always generate an SVG first
-            if svg_img is None:
-                svg_tmp_filename = mkstemp()[1]
-                self.capture_console.save_svg(
-                    svg_tmp_filename,
-                    title=self.title,
-                    theme=terminal_theme,
+        # Lazy-load PNG / PDF libraries if needed
+        converters = {}
+        if ".png" in img_suffixes or ".pdf" in img_suffixes:
+            try:
+                from cairosvg import svg2pdf, svg2png
+
+                # Scale PNGs with the terminal width, unless set - rasterising cost scales with pixel count
+                png_width = self.png_width or max(1600, self.capture_console.width * 15)
+                converters = {".png": partial(svg2png, dpi=300, output_width=png_width), ".pdf": svg2pdf}
+            except ImportError as e:
+                log.debug(e)
+                log.error("CairoSVG not installed, cannot convert SVG to PNG or PDF.")
+                log.info("Please install with cairo extra: 'rich-codex[cairo]'")
+            except OSError as e:
+                log.debug(e)
+                log.error(
+                    "⚠️  Missing [link=https://cairosvg.org/documentation/]CairoSVG dependencies[/], "
+                    "cannot convert SVG to PNG or PDF. ⚠️\n"
+                    "[red]Skipping PNG / PDF images[/]"
                 )
+
+        # We always generate an SVG first
+        svg_bytes = self._get_svg(terminal_theme).encode("utf-8")
+        self.release_console()
+
+        # Convert to PNG / PDF once per format, in memory - in parallel if we need both
+        img_data = {".svg": svg_bytes}
+        raster_suffixes = [suffix for suffix in converters if suffix in img_suffixes]
+        for suffix in raster_suffixes:
+            log.debug(f"Converting SVG to {suffix[1:].upper()}")
+        futures = {}
+        if len(raster_suffixes) > 1 and _CONVERT_EXECUTOR is not False:
+            try:
+                executor = _get_convert_executor()
+                for suffix in raster_suffixes:
+                    futures[suffix] = executor.submit(converters[suffix], bytestring=svg_bytes)
+            except (OSError, NotImplementedError) as e:
+                log.debug(f"Can't start worker processes, converting images one at a time: {e}")
+                _disable_convert_executor()
+                futures = {}
+        for suffix in raster_suffixes:
+            if suffix in futures:
+                img_data[suffix] = futures[suffix].result()
             else:
-                # Use already-generated SVG
-                svg_tmp_filename = svg_img
+                img_data[suffix] = converters[suffix](bytestring=svg_bytes)
 
-            # Save the SVG image if requested
-            if filename.lower().endswith(".svg"):
-                if self._enough_image_difference(svg_tmp_filename, filename):
-                    copyfile(svg_tmp_filename, filename)
-                svg_img = filename
+        # Save image as requested with $IMG_PATHS
+        made_dirs = set()
+        for filename in img_paths:
+            suffix = Path(filename).suffix.lower()
+            if suffix not in img_data:
+                continue
 
-            # Lazy-load PNG / PDF libraries if needed
-            if filename.lower().endswith(".png") or filename.lower().endswith(".pdf"):
-                try:
-                    from cairosvg import svg2pdf, svg2png
-                except ImportError as e:
-                    log.debug(e)
-                    log.error("CairoSVG not installed, cannot convert SVG to PNG or PDF.")
-                    log.info("Please install with cairo extra: 'rich-codex[cairo]'")
-                    continue
-                except OSError as e:
-                    log.debug(e)
-                    log.error(
-                        "⚠️  Missing [link=https://cairosvg.org/documentation/]CairoSVG dependencies[/], "
-                        "cannot convert SVG to PNG or PDF. ⚠️\n"
-                        f"[red]Skipping image '{filename}'[/]"
-                    )
-                    continue
+            # Make directories if necessary
+            img_dir = Path(filename).parent
+            if img_dir not in made_dirs:
+                img_dir.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(img_dir)
 
-                # Convert to PNG if requested
-                if filename.lower().endswith(".png"):
-                    log.debug(f"Converting SVG '{svg_tmp_filename}' to PNG '{filename}'")
-                    svg2png(
-                        file_obj=open(svg_tmp_filename, "rb"),
-                        write_to=tmp_filename,
-                        dpi=300,
-                        output_width=4000,
-                    )
-                    if self._enough_image_difference(tmp_filename, filename):
-                        copyfile(tmp_filename, filename)
-                        png_img = filename
-
-                # Convert to PDF if requested
-                if filename.lower().endswith(".pdf"):
-                    log.debug(f"Converting SVG '{svg_tmp_filename}' to PDF '{filename}'")
-                    svg2pdf(
-                        file_obj=open(svg_tmp_filename, "rb"),
-                        write_to=tmp_filename,
-                    )
-                    if self._enough_image_difference(tmp_filename, filename):
-                        copyfile(tmp_filename, filename)
-                        pdf_img = filename
-
-            # Delete temprary files
-            tmp_path = Path(tmp_filename)
-            if tmp_path.is_relative_to(gettempdir()):
-                tmp_path.unlink()
-
-        # Delete temporary SVG file - after loop as can be reused
-        tmp_svg_path = Path(svg_tmp_filename)
-        if tmp_svg_path.is_relative_to(gettempdir()):
-            tmp_svg_path.unlink()
+            if self._enough_image_difference(img_data[suffix], filename):
+                Path(filename).write_bytes(img_data[suffix])